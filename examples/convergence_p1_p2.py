@@ -0,0 +1,43 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.mesh import unit_square_tri_mesh, unit_square_boundary_mask
+from src.fem import dof_map
+from src.assemble import assemble_poisson
+from src.boundary import apply_dirichlet
+from src.linsolve import cg_solve
+from src.error import l2_error
+from src.solve import manufactured_u, manufactured_f
+
+def solve_uniform(n, element):
+    """Solve the manufactured problem on a uniform n x n mesh. Returns (ndof, L2 error, seconds)."""
+    t0 = time.perf_counter()
+    coords, tris, _ = unit_square_tri_mesh(n, n)
+    A, b = assemble_poisson(coords, tris, lambda x,y: 1.0, manufactured_f, element)
+    dof_coords, _ = dof_map(coords, tris, element)
+    bmask = unit_square_boundary_mask(dof_coords)
+    A, b = apply_dirichlet(A, b, bmask, manufactured_u(dof_coords[:,0], dof_coords[:,1]))
+    u, info, _ = cg_solve(A, b, rtol=1e-12, maxiter=len(b))
+    elapsed = time.perf_counter() - t0
+    return len(b), l2_error(coords, tris, u, manufactured_u, element), elapsed
+
+if __name__ == "__main__":
+    # L2 convergence of P1 vs P2 under uniform refinement, and the cheapest
+    # mesh that reaches a target error with each element.
+    target = 1e-4
+    for element in ["P1", "P2"]:
+        print(f"{element}:  {'n':>4} {'DOFs':>7} {'L2 error':>10} {'rate':>5} {'time [s]':>9}")
+        prev, hit = None, None
+        for n in [4, 8, 16, 32, 64, 128]:
+            ndof, err, t = solve_uniform(n, element)
+            rate = "" if prev is None else f"{prev/err:.1f}x"
+            print(f"      {n:>4} {ndof:>7} {err:>10.3e} {rate:>5} {t:>9.3f}")
+            if hit is None and err <= target:
+                hit = (ndof, t)
+            prev = err
+        if hit is None:
+            print(f"  target L2 error {target:.0e} not reached")
+        else:
+            print(f"  target L2 error {target:.0e} reached with {hit[0]} DOFs in {hit[1]:.3f}s")
@@ -0,0 +1,33 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.mesh import unit_square_tri_mesh, unit_square_boundary_mask
+from src.fem import dof_map
+from src.assemble import assemble_poisson
+from src.boundary import apply_dirichlet
+from src.linsolve import cg_solve, mixed_precision_solve
+from src.solve import manufactured_u, manufactured_f
+
+def build_system(n, element):
+    """Poisson system on a uniform n x n mesh with Dirichlet BCs applied."""
+    coords, tris, _ = unit_square_tri_mesh(n, n)
+    A, b = assemble_poisson(coords, tris, lambda x,y: 1.0, manufactured_f, element)
+    dof_coords, _ = dof_map(coords, tris, element)
+    bmask = unit_square_boundary_mask(dof_coords)
+    return apply_dirichlet(A, b, bmask, manufactured_u(dof_coords[:,0], dof_coords[:,1]))
+
+if __name__ == "__main__":
+    # usage: python examples/mixed_precision_benchmark.py [P1:256 P1:512 ...]
+    cases = sys.argv[1:] or ["P1:128", "P1:256", "P1:512"]
+    print(f"{'case':>9} {'DOFs':>8} {'f64 its':>8} {'f64 s':>7} {'mix its':>8} {'mix s':>7} "
+          f"{'bytes':>6} {'time':>6} {'residual':>9}")
+    for case in cases:
+        element, n = case.split(":")
+        A, b = build_system(int(n), element)
+        _, _, ref = cg_solve(A, b, rtol=1e-10, maxiter=len(b))
+        _, info, diag = mixed_precision_solve(A, b, rtol=1e-10, maxiter=len(b), reference=ref)
+        # bytes/time: mixed relative to float64 (< 1 is a saving)
+        print(f"{case:>9} {len(b):>8} {ref['iterations']:>8} {ref['time']:>7.3f} "
+              f"{diag['iterations']:>8} {diag['time']:>7.3f} {diag['bandwidth_ratio']:>6.2f} "
+              f"{diag['time']/ref['time']:>6.2f} {diag['residual']:>9.1e}")
@@ -6,16 +6,24 @@ This demonstrates the "wow factor" of AMR in action.
 
 import sys
 import os
+import argparse
+import glob
+import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # non-interactive backend, safe in worker processes
 import matplotlib.pyplot as plt
 from matplotlib.tri import Triangulation
+from PIL import Image
 import meshio
 from src.solve import solve_adaptive
 
-def visualize_cycle(coords, tris, u, eta, cycle, save_path="outputs/images"):
-    """Create visualization for a single refinement cycle."""
+def visualize_cycle(coords, tris, u, eta, cycle, save_path="outputs/images", dpi=150):
+    """Create visualization for a single refinement cycle. Returns the image path."""
     
     # Create triangulation
     tri = Triangulation(coords[:, 0], coords[:, 1], tris)
@@ -47,15 +55,89 @@ def visualize_cycle(coords, tris, u, eta, cycle, save_path="outputs/images"):
     axes[2].set_ylabel('y')
     
     plt.tight_layout()
-    plt.savefig(f'{save_path}/cycle_{cycle:02d}.png', dpi=150, bbox_inches='tight')
-    plt.close()
+    path = f'{save_path}/cycle_{cycle:02d}.png'
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+def load_vtu_states(cycles=None, vtu_dir="outputs/vtu"):
+    """Read per-cycle states back from VTU files (offline post-processing).
+    Loads cycles 0..cycles-1 that exist, or every solution_cycle*.vtu if cycles is None."""
+    if cycles is None:
+        found = glob.glob(f"{vtu_dir}/solution_cycle*.vtu")
+        cycle_ids = sorted(int(m.group(1)) for m in
+                           (re.search(r"solution_cycle(\d+)\.vtu$", f) for f in found) if m)
+    else:
+        cycle_ids = range(cycles)
+    states = []
+    for cycle in cycle_ids:
+        vtu_file = f"{vtu_dir}/solution_cycle{cycle}.vtu"
+        if os.path.exists(vtu_file):
+            mesh = meshio.read(vtu_file)
+            states.append({
+                "cycle": cycle,
+                "coords": mesh.points[:, :2],
+                "tris": mesh.cells[0].data,
+                "u": mesh.point_data['u'],
+                "eta": mesh.cell_data['eta'][0],
+            })
+    return states
+
+def render_cycles(states, save_path="outputs/images", dpi=150, workers=None):
+    """Render one frame per cycle state in a process pool. Returns frame paths in cycle order."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(visualize_cycle, s["coords"], s["tris"], s["u"], s["eta"],
+                               s["cycle"], save_path, dpi)
+                   for s in states]
+        frames = [f.result() for f in futures]
     
-    print(f"Cycle {cycle}: {len(coords)} nodes, {len(tris)} elements, "
-          f"u range [{u.min():.6f}, {u.max():.6f}], "
-          f"η range [{eta.min():.6f}, {eta.max():.6f}]")
+    for s in states:
+        u, eta = s["u"], s["eta"]
+        print(f"Cycle {s['cycle']}: {len(s['coords'])} nodes, {len(s['tris'])} elements, "
+              f"u range [{u.min():.6f}, {u.max():.6f}], "
+              f"η range [{eta.min():.6f}, {eta.max():.6f}]")
+    return frames
+
+def gif_frame(path, size=(1200, 400)):
+    """Load one frame image as a size-pixel palette image, scaled to fit without
+    distortion and centred on a white canvas (bbox-tight frames differ in size)."""
+    with Image.open(path) as im:
+        im = im.convert("RGB")
+        im.thumbnail(size, Image.LANCZOS)
+        canvas = Image.new("RGB", size, "white")
+        canvas.paste(im, ((size[0] - im.width) // 2, (size[1] - im.height) // 2))
+    return canvas.quantize(colors=256)
 
-def run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3):
-    """Run adaptive refinement demo with visualization."""
+def assemble_animation(frames, path="outputs/animations/refinement_animation.gif", duration=1000,
+                       size=(1200, 400)):
+    """Assemble frame images into a looping GIF of the given size. Frames are shrunk
+    one at a time as they are loaded, so only the small palette frames are kept.
+    Returns the GIF path, or None if there are no frames."""
+    if not frames:
+        return None
+    images = [gif_frame(f, size) for f in frames]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=duration, loop=0)
+    return path
+
+def render_offline(cycles=None, workers=None, dpi=150, vtu_dir="outputs/vtu"):
+    """Render frames and animation from existing VTU files, without solving."""
+    
+    os.makedirs("outputs/images", exist_ok=True)
+    os.makedirs("outputs/animations", exist_ok=True)
+    states = load_vtu_states(cycles, vtu_dir)
+    if not states:
+        print(f"No VTU files found in {vtu_dir}/ (expected solution_cycle<N>.vtu).")
+        print("Run the solver first, e.g.: python scripts/run_adaptive_refinement.py --write-vtk")
+        return None
+    print(f"Rendering {len(states)} cycles from {vtu_dir}/ ...")
+    frames = render_cycles(states, dpi=dpi, workers=workers)
+    gif = assemble_animation(frames)
+    print(f"\nVisualizations saved to outputs/images/cycle_XX.png")
+    print(f"Animation saved to {gif}")
+    return gif
+
+def run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3, workers=None, dpi=150, write_vtk=False):
+    """Run adaptive refinement demo with visualization (write_vtk also saves per-cycle VTU files)."""
     
     print(f"Starting adaptive refinement demo:")
     print(f"  Initial mesh: {nx}x{ny} = {nx*ny*2} elements")
@@ -64,12 +146,15 @@ def run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3):
     print("-" * 50)
     
     # Create output directories
-    os.makedirs("outputs/vtu", exist_ok=True)
+    if write_vtk:
+        os.makedirs("outputs/vtu", exist_ok=True)
     os.makedirs("outputs/images", exist_ok=True)
     os.makedirs("outputs/animations", exist_ok=True)
     
-    # Run the adaptive solver
-    coords, tris, u, eta = solve_adaptive(nx=nx, ny=ny, cycles=cycles, refine_frac=refine_frac)
+    # Run the adaptive solver, keeping per-cycle states in memory
+    states = []
+    coords, tris, u, eta = solve_adaptive(nx=nx, ny=ny, cycles=cycles, refine_frac=refine_frac,
+                                          states=states, write_vtk=write_vtk)
     
     print("-" * 50)
     print("Final results:")
@@ -79,22 +164,26 @@ def run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3):
     
     # Generate visualizations for each cycle
     print("\nGenerating visualizations...")
-    for cycle in range(cycles):
-        # Read the VTU file for this cycle
-        vtu_file = f"outputs/vtu/solution_cycle{cycle}.vtu"
-        if os.path.exists(vtu_file):
-            mesh = meshio.read(vtu_file)
-            points = mesh.points[:, :2]
-            triangles = mesh.cells[0].data
-            u_cycle = mesh.point_data['u']
-            eta_cycle = mesh.cell_data['eta'][0]
-            
-            visualize_cycle(points, triangles, u_cycle, eta_cycle, cycle)
+    frames = render_cycles(states, dpi=dpi, workers=workers)
+    gif = assemble_animation(frames)
     
     print(f"\nVisualizations saved to outputs/images/cycle_XX.png")
-    print("You can create a GIF using:")
-    print("  convert -delay 100 -loop 0 outputs/images/cycle_*.png outputs/animations/refinement_animation.gif")
+    print(f"Animation saved to {gif}")
 
 if __name__ == "__main__":
-    # Run the demo
-    run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=None,
+                        help="refinement cycles (default 4; with --from-vtu, all files found)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--from-vtu", action="store_true", help="skip the solve and render from existing outputs/vtu/*.vtu")
+    parser.add_argument("--write-vtk", action="store_true", help="also write outputs/vtu/solution_cycle*.vtu for ParaView")
+    args = parser.parse_args()
+    
+    if args.from_vtu:
+        if render_offline(cycles=args.cycles, workers=args.workers, dpi=args.dpi) is None:
+            sys.exit(1)
+    else:
+        # Run the demo
+        run_adaptive_demo(nx=8, ny=8, cycles=args.cycles or 4, refine_frac=0.3,
+                          workers=args.workers, dpi=args.dpi, write_vtk=args.write_vtk) 
\ No newline at end of file
@@ -25,7 +25,7 @@ def main():
     try:
         # Run the adaptive refinement demo
         from scripts.run_adaptive_refinement import run_adaptive_demo
-        run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3)
+        run_adaptive_demo(nx=8, ny=8, cycles=4, refine_frac=0.3, write_vtk=True)
         
         print("\n✅ Demo completed successfully!")
         print("\n📁 Output files:")
@@ -1,43 +1,62 @@
 import numpy as np
 from scipy.sparse import coo_matrix
 
-from .fem import tri_grad_phi
+from .fem import tri_geometry, map_points, dof_map, ref_tables, default_quad_order
 
-def assemble_poisson(coords, tris, kappa_fn, f_fn):
+def eval_coefficient(fn, x, y):
+    """
+    Evaluate a coefficient on an array of points in one call; constant results
+    are broadcast. Coefficients written for scalars only (e.g. using math.sin
+    or `if x < 0.5`) fall back to a pointwise np.vectorize evaluation.
+    Args:
+        fn: (x,y)->scalar or array
+        x, y: arrays of the same shape
+    Returns:
+        values: float array with the shape of x
+    """
+    try:
+        return np.broadcast_to(np.asarray(fn(x, y), dtype=float), x.shape)
+    except (TypeError, ValueError):
+        return np.vectorize(fn, otypes=[float])(x, y)
+
+def assemble_poisson(coords, tris, kappa_fn, f_fn, element="P1", quad_order=None):
     """
     Assemble global stiffness matrix A and load vector b for Poisson.
     Args:
         coords: (N,2)
         tris: (M,3)
-        kappa_fn: (x,y)->scalar
-        f_fn: (x,y)->scalar
+        kappa_fn: (x,y)->scalar, called with (M,Q) arrays of quadrature points
+                  (scalar-only functions are evaluated pointwise, slower)
+        f_fn: (x,y)->scalar, same calling convention as kappa_fn
+        element: "P1" or "P2"
+        quad_order: quadrature order (1..6), default 2*degree
     Returns:
-        A: (N,N) stiffness matrix
+        A: (Ndof,Ndof) stiffness matrix
+        b: (Ndof,) load vector
     """
-    n = coords.shape[0]
-    rows, cols, data = [], [], []
-    b = np.zeros(n)
-
-    # simple 1-point quadrature at triangle centroid (fine for P1 demo)
-    for tri in tris:
-        grads, area2 = tri_grad_phi(coords, tri)   # area2 = 2*area
-        area = area2
-        # centroid
-        xc = coords[tri].mean(axis=0)
-        kappa = float(kappa_fn(xc[0], xc[1]))
-        Ke = kappa * area * (grads @ grads.T)
-
-        # assemble stiffness
-        for a in range(3):
-            ia = tri[a]
-            for b_ in range(3):
-                ib = tri[b_]
-                rows.append(ia); cols.append(ib); data.append(Ke[a,b_])
-
-        # load (use centroid rule too)
-        fe = np.array([f_fn(xc[0], xc[1])/3.0]*3) * area
-        for a in range(3):
-            b[tri[a]] += fe[a]
-
-    A = coo_matrix((data, (rows, cols)), shape=(n, n)).tocsr()
-    return A, b
\ No newline at end of file
+    if quad_order is None:
+        quad_order = default_quad_order(element)
+    dof_coords, elem_dofs = dof_map(coords, tris, element)
+    n = dof_coords.shape[0]
+    nloc = elem_dofs.shape[1]
+
+    points, weights, phi, dphi = ref_tables(element, quad_order)
+    x0, J, invJT, area = tri_geometry(coords, tris)
+
+    # coefficients at all quadrature points of all elements in one call
+    xq = map_points(x0, J, points)                              # (M,Q,2)
+    kappa = eval_coefficient(kappa_fn, xq[..., 0], xq[..., 1])  # (M,Q)
+    f = eval_coefficient(f_fn, xq[..., 0], xq[..., 1])          # (M,Q)
+
+    # physical gradients of the local basis at quadrature points
+    grads = np.einsum('qik,elk->eqil', dphi, invJT)             # (M,Q,nloc,2)
+
+    wk = kappa * weights * area[:, None]                        # (M,Q)
+    Ke = np.einsum('eq,eqik,eqjk->eij', wk, grads, grads)       # (M,nloc,nloc)
+    fe = np.einsum('eq,qi->ei', f * weights * area[:, None], phi)
+
+    rows = np.repeat(elem_dofs, nloc, axis=1).ravel()
+    cols = np.tile(elem_dofs, (1, nloc)).ravel()
+    A = coo_matrix((Ke.ravel(), (rows, cols)), shape=(n, n)).tocsr()
+    b = np.bincount(elem_dofs.ravel(), weights=fe.ravel(), minlength=n)
+    return A, b
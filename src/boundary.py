@@ -26,11 +26,12 @@ def apply_dirichlet(A, b, boundary_mask, gvals):
         b[i] = gvals[i]
 
     # Zero columns of fixed for free rows
+    fixed_set = set(fixed)
     for i in free:
         row_cols = A.rows[i]
         row_data = A.data[i]
         for k, col in enumerate(list(row_cols)):
-            if col in set(fixed) and col != i:
+            if col in fixed_set and col != i:
                 # set A[i, col] = 0
                 idx = row_cols.index(col)
                 row_cols.pop(idx)
@@ -1,57 +1,85 @@
 
 import numpy as np
-from .fem import tri_grad_phi, tri_area
+from .fem import (tri_geometry, map_points, dof_map, ref_basis, ref_tables,
+                  default_quad_order, REF_NODES)
+from .assemble import eval_coefficient
 
-def element_grad_u(coords, tris, u):
+def element_grad_u(coords, tris, u, element="P1", xi=None):
     """
-    Compute constant grad u_h per triangle.
+    Compute grad u_h per triangle at reference points.
     Args:
         coords: (N,2)
         tris: (M,3)
-        u: (N,)
+        u: (Ndof,)
+        element: "P1" or "P2"
+        xi: (P,2) reference points; default the element centroid
     Returns:
-        grads: (M,2)
+        grads: (M,2) if xi is None, else (M,P,2)
     """
-    grads = np.zeros((tris.shape[0], 2))
-    for e, tri in enumerate(tris):
-        g, area2 = tri_grad_phi(coords, tri)
-        uh = u[tri]
-        # grad u_h = sum_i u_i grad phi_i
-        grads[e,:] = uh @ g
-    return grads
+    _, elem_dofs = dof_map(coords, tris, element)
+    _, _, invJT, _ = tri_geometry(coords, tris)
+    pts = np.array([[1/3, 1/3]]) if xi is None else xi
+    _, dphi = ref_basis(element, pts)
+    # grad u_h = sum_i u_i grad phi_i
+    g_ref = np.einsum('ei,pik->epk', u[elem_dofs], dphi)
+    grads = np.einsum('elk,epk->epl', invJT, g_ref)
+    return grads[:, 0, :] if xi is None else grads
 
-def zz_error_indicators(coords, tris, u):
+def zz_error_indicators(coords, tris, u, element="P1", quad_order=None):
     """
-    Simple ZZ indicator: L2 norm of (grad u_h - recovered nodal grad) over element.
-    Here we approximate by: |T| * ||avg(nodal recovered) - grad(u_h)||^2
+    ZZ indicator: eta_T = ||G(u_h) - grad u_h||^2_{L2(T)}, where G(u_h) is the
+    recovered gradient, interpolated in the same element space as u_h from
+    area-weighted averages of grad u_h at the DOF locations.
     Args:
         coords: (N,2)
         tris: (M,3)
-        u: (N,)
+        u: (Ndof,)
+        element: "P1" or "P2"
+        quad_order: quadrature order (1..6), default 2*degree
     Returns:
         eta: (M,)
     """
-    m = tris.shape[0]
-    grads_T = element_grad_u(coords, tris, u)            # (m,2)
+    if quad_order is None:
+        quad_order = default_quad_order(element)
+    dof_coords, elem_dofs = dof_map(coords, tris, element)
+    n = dof_coords.shape[0]
+    _, _, _, areas = tri_geometry(coords, tris)
 
-    # recover nodal gradient by area-weighted average
-    n = coords.shape[0]
-    sum_g = np.zeros((n,2))
-    sum_a = np.zeros(n)
-
-    areas = np.array([tri_area(coords, tri) for tri in tris])
-    for e, tri in enumerate(tris):
-        for v in tri:
-            sum_g[v] += grads_T[e] * areas[e]
-            sum_a[v] += areas[e]
-    nodal_g = np.zeros((n,2))
+    # recover gradient at DOFs by area-weighted average over adjacent elements
+    g_nodes = element_grad_u(coords, tris, u, element, REF_NODES[element])  # (M,nloc,2)
+    idx = elem_dofs.ravel()
+    w = np.repeat(areas, elem_dofs.shape[1])
+    sum_a = np.bincount(idx, weights=w, minlength=n)
+    nodal_g = np.stack([np.bincount(idx, weights=w*g_nodes[..., k].ravel(), minlength=n)
+                        for k in range(2)], axis=1)
     nz = sum_a > 0
-    nodal_g[nz] = (sum_g[nz].T / sum_a[nz]).T
+    nodal_g[nz] /= sum_a[nz, None]
+
+    # integrate |G - grad u_h|^2 with the quadrature rule
+    points, weights, phi, _ = ref_tables(element, quad_order)
+    G = np.einsum('qi,eik->eqk', phi, nodal_g[elem_dofs])
+    gh = element_grad_u(coords, tris, u, element, points)
+    diff = G - gh
+    return areas * np.einsum('q,eqk,eqk->e', weights, diff, diff)
 
-    # element indicator: compare element grad to nodal average at its vertices
-    eta = np.zeros(m)
-    for e, tri in enumerate(tris):
-        gbar = nodal_g[tri].mean(axis=0)
-        diff = gbar - grads_T[e]
-        eta[e] = areas[e] * (diff @ diff)
-    return eta
+def l2_error(coords, tris, u, exact_fn, element="P1", quad_order=None):
+    """
+    L2 norm of u_h - u_exact, with u_exact evaluated at all quadrature points.
+    Args:
+        coords: (N,2)
+        tris: (M,3)
+        u: (Ndof,)
+        exact_fn: (x,y)->scalar, evaluated as kappa_fn in assemble_poisson
+        element: "P1" or "P2"
+        quad_order: quadrature order (1..6), default 2*degree+2
+    Returns:
+        err: float
+    """
+    if quad_order is None:
+        quad_order = min(default_quad_order(element) + 2, 6)
+    _, elem_dofs = dof_map(coords, tris, element)
+    x0, J, _, areas = tri_geometry(coords, tris)
+    points, weights, phi, _ = ref_tables(element, quad_order)
+    xq = map_points(x0, J, points)
+    diff = u[elem_dofs] @ phi.T - eval_coefficient(exact_fn, xq[..., 0], xq[..., 1])
+    return float(np.sqrt(np.sum(areas * (diff**2 @ weights))))
@@ -1,5 +1,9 @@
+from functools import lru_cache
+
 import numpy as np
 
+from .quadrature import triangle_quadrature
+
 def tri_area(coords, tri):
     """
     Calculate the area of a triangle.
@@ -8,6 +12,8 @@ def tri_area(coords, tri):
         tri: array of 3 node indices defining the triangle
     Returns:
         Area of the triangle using the determinant formula.
+    Single-triangle helper kept for external use; assembly and error
+    estimation use the batched tri_geometry.
     """
     x0, y0 = coords[tri[0]]
     x1, y1 = coords[tri[1]]
@@ -22,7 +28,9 @@ def tri_grad_phi(coords, tri):
         coords: array of node coordinates
         tri: array of 3 node indices defining the triangle
     Returns:
-        Gradients as (3,2) for nodes (v0,v1,v2).
+        Gradients as (3,2) for nodes (v0,v1,v2), and the triangle area.
+    Single-triangle helper kept for external use; assembly and error
+    estimation use the batched tri_geometry.
     """
     x = coords[tri]
 
@@ -40,6 +48,125 @@ def tri_grad_phi(coords, tri):
                           [ 1.,  0.],
                           [ 0.,  1.]])
 
-    invJT = np.linalg.inv(J).T
-    grads = ref_grads @ invJT
-    return grads, 0.5*abs(detJ)
\ No newline at end of file
+    # grad phi = J^{-T} grad_ref phi, i.e. row-wise ref_grads @ J^{-1}
+    grads = ref_grads @ np.linalg.inv(J)
+    return grads, 0.5*abs(detJ)
+
+# ---------------------------------------------------------------------------
+# Element tables (P1 / P2 Lagrange) and batched geometry
+# ---------------------------------------------------------------------------
+
+ELEMENT_DEGREE = {"P1": 1, "P2": 2}
+
+# Local node positions on the reference triangle.
+# P2 ordering: vertices v0,v1,v2 then edge midpoints m01,m12,m20.
+REF_NODES = {
+    "P1": np.array([[0., 0.], [1., 0.], [0., 1.]]),
+    "P2": np.array([[0., 0.], [1., 0.], [0., 1.],
+                    [.5, 0.], [.5, .5], [0., .5]]),
+}
+
+def element_degree(element):
+    """Polynomial degree of an element type ("P1" or "P2")."""
+    if element not in ELEMENT_DEGREE:
+        raise ValueError(f"unknown element {element!r}, expected one of {sorted(ELEMENT_DEGREE)}")
+    return ELEMENT_DEGREE[element]
+
+def default_quad_order(element):
+    """Quadrature order exact for the element mass matrix (2*degree)."""
+    return 2 * element_degree(element)
+
+def ref_basis(element, xi):
+    """
+    Evaluate reference basis functions and their gradients.
+    Args:
+        element: "P1" or "P2"
+        xi: (P,2) points on the reference triangle
+    Returns:
+        phi: (P,nloc) basis values
+        dphi: (P,nloc,2) reference gradients
+    """
+    element_degree(element)
+    xi = np.asarray(xi, dtype=float)
+    x, y = xi[:, 0], xi[:, 1]
+    L = np.stack([1.0 - x - y, x, y], axis=1)        # barycentric (P,3)
+    dL = np.array([[-1., -1.], [1., 0.], [0., 1.]])  # (3,2)
+    if element == "P1":
+        return L, np.broadcast_to(dL, (len(xi), 3, 2)).copy()
+
+    # P2: vertex functions L_i(2L_i-1), edge functions 4 L_i L_j
+    phi = np.empty((len(xi), 6))
+    dphi = np.empty((len(xi), 6, 2))
+    for i in range(3):
+        phi[:, i] = L[:, i] * (2.0*L[:, i] - 1.0)
+        dphi[:, i, :] = np.outer(4.0*L[:, i] - 1.0, dL[i])
+    for k, (i, j) in enumerate([(0, 1), (1, 2), (2, 0)]):
+        phi[:, 3+k] = 4.0 * L[:, i] * L[:, j]
+        dphi[:, 3+k, :] = 4.0 * (np.outer(L[:, j], dL[i]) + np.outer(L[:, i], dL[j]))
+    return phi, dphi
+
+@lru_cache(maxsize=None)
+def ref_tables(element, quad_order):
+    """
+    Cached basis tables at the points of a reference quadrature rule.
+    Args:
+        element: "P1" or "P2"
+        quad_order: quadrature order (1..6)
+    Returns:
+        points: (Q,2), weights: (Q,), phi: (Q,nloc), dphi: (Q,nloc,2)
+    """
+    points, weights = triangle_quadrature(quad_order)
+    phi, dphi = ref_basis(element, points)
+    phi.flags.writeable = False
+    dphi.flags.writeable = False
+    return points, weights, phi, dphi
+
+def tri_geometry(coords, tris):
+    """
+    Affine maps of all triangles at once.
+    Args:
+        coords: (N,2)
+        tris: (M,3) vertex indices
+    Returns:
+        x0: (M,2) first vertex of each triangle
+        J: (M,2,2) Jacobians of the reference-to-physical map
+        invJT: (M,2,2) inverse-transpose Jacobians
+        area: (M,)
+    """
+    x = coords[tris[:, :3]]
+    x0 = x[:, 0, :]
+    J = np.stack([x[:, 1, :] - x0, x[:, 2, :] - x0], axis=2)
+    detJ = J[:, 0, 0]*J[:, 1, 1] - J[:, 0, 1]*J[:, 1, 0]
+    invJT = np.empty_like(J)
+    invJT[:, 0, 0] =  J[:, 1, 1] / detJ
+    invJT[:, 0, 1] = -J[:, 1, 0] / detJ
+    invJT[:, 1, 0] = -J[:, 0, 1] / detJ
+    invJT[:, 1, 1] =  J[:, 0, 0] / detJ
+    return x0, J, invJT, 0.5*np.abs(detJ)
+
+def map_points(x0, J, xi):
+    """Map reference points xi (P,2) into every triangle: returns (M,P,2)."""
+    return x0[:, None, :] + np.einsum('ekl,pl->epk', J, xi)
+
+def dof_map(coords, tris, element="P1"):
+    """
+    Global degrees of freedom for an element type.
+    P2 adds one DOF per edge midpoint, numbered after the N vertices,
+    so u[:N] are always the vertex values.
+    Args:
+        coords: (N,2)
+        tris: (M,3)
+        element: "P1" or "P2"
+    Returns:
+        dof_coords: (Ndof,2) DOF locations
+        elem_dofs: (M,nloc) DOF indices per element
+    """
+    if element_degree(element) == 1:
+        return coords, tris
+    edges = np.sort(tris[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 3, 2), axis=2)
+    uniq, inv = np.unique(edges.reshape(-1, 2), axis=0, return_inverse=True)
+    n = coords.shape[0]
+    mids = 0.5 * (coords[uniq[:, 0]] + coords[uniq[:, 1]])
+    dof_coords = np.vstack([coords, mids])
+    elem_dofs = np.hstack([tris, n + inv.reshape(-1, 3)])
+    return dof_coords, elem_dofs
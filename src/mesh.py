@@ -31,9 +31,17 @@ def unit_square_tri_mesh(nx: int, ny:int):
             tris.append([v10, v11, v01])
     tris = np.array(tris)
 
-    # boundary mask: nodes on edges x=0, x=1, y=0, y=1
-    tol = 1e-12
+    bmask = unit_square_boundary_mask(coords)
+    return coords, tris, bmask
+
+def unit_square_boundary_mask(coords, tol=1e-12):
+    """
+    Boundary mask for points of the unit square: x=0, x=1, y=0, y=1.
+    Args:
+        coords: (N,2)
+    Returns:
+        bmask: boolean mask (N,)
+    """
     bx = (np.abs(coords[:,0])<tol) | (np.abs(coords[:,0]-1.0)<tol)
     by = (np.abs(coords[:,1])<tol) | (np.abs(coords[:,1]-1.0)<tol)
-    bmask = bx | by
-    return coords, tris, bmask
\ No newline at end of file
+    return bx | by
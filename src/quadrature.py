@@ -0,0 +1,62 @@
+import numpy as np
+
+def _sym3(a, w):
+    """Orbit of barycentric point (a, b, b) with b = (1-a)/2: 3 points."""
+    b = 0.5 * (1.0 - a)
+    return [(a, b, b), (b, a, b), (b, b, a)], [w]*3
+
+def _sym6(a, b, w):
+    """Orbit of barycentric point (a, b, c) with c = 1-a-b: 6 points."""
+    c = 1.0 - a - b
+    pts = [(a, b, c), (a, c, b), (b, a, c), (b, c, a), (c, a, b), (c, b, a)]
+    return pts, [w]*6
+
+def _rule(*orbits):
+    """
+    Stack symmetric orbits into a reference-triangle rule.
+    Returns:
+        points: (Q,2) reference coordinates (xi, eta) = (L1, L2)
+        weights: (Q,) weights summing to 1 (multiply by element area)
+    """
+    bary, w = [], []
+    for pts, ws in orbits:
+        bary += pts
+        w += ws
+    bary = np.array(bary, dtype=float)
+    points = np.ascontiguousarray(bary[:, 1:])
+    weights = np.array(w, dtype=float)
+    points.flags.writeable = False
+    weights.flags.writeable = False
+    return points, weights
+
+# Symmetric rules on the reference triangle (0,0),(1,0),(0,1).
+# Orders 1,2,4,5,6 are Dunavant (1985); order 3 is the positive-weight
+# 6-point Strang-Fix rule (Dunavant's 4-point rule has a negative weight).
+QUAD_RULES = {
+    1: _rule(([(1/3, 1/3, 1/3)], [1.0])),
+    2: _rule(_sym3(2/3, 1/3)),
+    3: _rule(_sym6(0.659027622374092, 0.231933368553031, 1/6)),
+    4: _rule(_sym3(0.108103018168070, 0.223381589678011),
+             _sym3(0.816847572980459, 0.109951743655322)),
+    5: _rule(([(1/3, 1/3, 1/3)], [0.225]),
+             _sym3(0.059715871789770, 0.132394152788506),
+             _sym3(0.797426985353087, 0.125939180544827)),
+    6: _rule(_sym3(0.501426509658179, 0.116786275726379),
+             _sym3(0.873821971016996, 0.050844906370207),
+             _sym6(0.053145049844817, 0.310352451033784, 0.082851075618374)),
+}
+
+MAX_QUAD_ORDER = max(QUAD_RULES)
+
+def triangle_quadrature(order):
+    """
+    Look up a precomputed quadrature rule on the reference triangle.
+    Args:
+        order: polynomial degree integrated exactly (1..6)
+    Returns:
+        points: (Q,2) reference coordinates
+        weights: (Q,) weights summing to 1
+    """
+    if order not in QUAD_RULES:
+        raise ValueError(f"quadrature order must be in 1..{MAX_QUAD_ORDER}, got {order}")
+    return QUAD_RULES[order]
@@ -1,9 +1,12 @@
 
+import warnings
+
 import numpy as np
-from scipy.sparse.linalg import cg
-from .mesh import unit_square_tri_mesh
+from .mesh import unit_square_tri_mesh, unit_square_boundary_mask
+from .fem import dof_map
 from .assemble import assemble_poisson
 from .boundary import apply_dirichlet
+from .linsolve import cg_solve, mixed_precision_solve
 from .error import zz_error_indicators
 from .refine import mark_top_fraction, refine_nvb
 from .io_vtk import write_vtu
@@ -30,7 +33,9 @@ def manufactured_f(x,y):
     """
     return 2*(np.pi**2) * np.sin(np.pi*x) * np.sin(np.pi*y)
 
-def solve_adaptive(nx=8, ny=8, cycles=1, refine_frac=0.3):
+def solve_adaptive(nx=8, ny=8, cycles=1, refine_frac=0.3, element="P1", quad_order=None,
+                   solver="cg", diagnostics=None, states=None, write_vtk=True,
+                   rtol=1e-10, maxiter=None, compare=False):
     """
     Solve Poisson equation with adaptive mesh refinement.
     Args:
@@ -38,33 +43,65 @@ def solve_adaptive(nx=8, ny=8, cycles=1, refine_frac=0.3):
         ny: number of subdivisions in y-direction
         cycles: number of refinement cycles
         refine_frac: fraction of elements to refine
+        element: "P1" or "P2"
+        quad_order: quadrature order (1..6), default 2*degree
+        solver: "cg" (float64 Jacobi-PCG) or "mixed" (float64 CG preconditioned in float32)
+        diagnostics: optional list; one dict of solve diagnostics is appended per cycle
+        states: optional list; one dict (cycle, coords, tris, u, eta) is appended per
+                cycle, with u the vertex values, for in-memory post-processing
+        write_vtk: write outputs/vtu/solution_cycle{cycle}.vtu each cycle
+        rtol: relative residual tolerance of the linear solve
+        maxiter: max (float64) CG iterations per solve, default the number of DOFs
+        compare: benchmark option; with solver="mixed", also run the float64 solve on
+                 each system and add measured bytes/time saved against it (negative
+                 if mixed cost more) to the diagnostics
+    Returns:
+        coords, tris: refined mesh
+        u: (Ndof,) last solution; u[:N] are vertex values
+        eta: (M,) last error indicators
     """
     coords, tris, bmask = unit_square_tri_mesh(nx, ny)
     for cycle in range(cycles):
         kappa = lambda x,y: 1.0
-        A, b = assemble_poisson(coords, tris, kappa, manufactured_f)
+        A, b = assemble_poisson(coords, tris, kappa, manufactured_f, element, quad_order)
 
-        # Dirichlet g = u_exact on boundary
-        g = manufactured_u(coords[:,0], coords[:,1])
+        # Dirichlet g = u_exact on boundary DOFs
+        dof_coords, _ = dof_map(coords, tris, element)
+        bmask = unit_square_boundary_mask(dof_coords)
+        g = manufactured_u(dof_coords[:,0], dof_coords[:,1])
         A, b = apply_dirichlet(A, b, bmask, g)
+        it_max = maxiter if maxiter is not None else len(b)
 
-        u, info = cg(A, b, rtol=1e-10, maxiter=200)
+        if solver == "mixed":
+            reference = cg_solve(A, b, rtol=rtol, maxiter=it_max)[2] if compare else None
+            u, info, diag = mixed_precision_solve(A, b, rtol=rtol, maxiter=it_max, reference=reference)
+        elif solver == "cg":
+            u, info, diag = cg_solve(A, b, rtol=rtol, maxiter=it_max)
+        else:
+            raise ValueError(f"unknown solver {solver!r}, expected 'cg' or 'mixed'")
+        diag["cycle"] = cycle
+        diag["converged"] = info == 0
         if info != 0:
-            print("CG did not fully converge, info=", info)
+            warnings.warn(f"cycle {cycle}: linear solve did not converge in {it_max} iterations "
+                          f"(residual {diag['residual']:.2e} > rtol {rtol:.0e}, info={info})",
+                          RuntimeWarning)
+        if diagnostics is not None:
+            diagnostics.append(diag)
 
         # error indicators
-        eta = zz_error_indicators(coords, tris, u)
+        eta = zz_error_indicators(coords, tris, u, element, quad_order)
+
+        # vertex values; P2 edge DOFs are numbered after vertices
+        u_vert = u[:len(coords)]
+        if states is not None:
+            states.append({"cycle": cycle, "coords": coords, "tris": tris, "u": u_vert, "eta": eta})
 
         # write VTK
-        write_vtu(coords, tris, point_data={"u": u}, cell_data={"eta":[eta]}, path=f"outputs/vtu/solution_cycle{cycle}.vtu")
+        if write_vtk:
+            write_vtu(coords, tris, point_data={"u": u_vert}, cell_data={"eta":[eta]}, path=f"outputs/vtu/solution_cycle{cycle}.vtu")
 
         # mark and refine using NVB
         marked = mark_top_fraction(eta, frac=refine_frac)
         coords, tris = refine_nvb(coords, tris, marked)
-        # recompute boundary mask (still unit square)
-        tol = 1e-12
-        bx = (np.abs(coords[:,0])<tol) | (np.abs(coords[:,0]-1.0)<tol)
-        by = (np.abs(coords[:,1])<tol) | (np.abs(coords[:,1]-1.0)<tol)
-        bmask = bx | by
 
     return coords, tris, u, eta
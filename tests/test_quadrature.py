@@ -0,0 +1,31 @@
+from math import factorial
+
+import numpy as np
+import pytest
+
+from src.quadrature import triangle_quadrature, MAX_QUAD_ORDER
+from src.fem import ref_basis, REF_NODES
+
+def monomial_mean(i, j):
+    """Mean of x^i y^j over the reference triangle: 2 i! j! / (i+j+2)!."""
+    return 2.0 * factorial(i) * factorial(j) / factorial(i + j + 2)
+
+@pytest.mark.parametrize("order", range(1, MAX_QUAD_ORDER + 1))
+def test_rule_exact_up_to_order(order):
+    points, weights = triangle_quadrature(order)
+    assert np.all(weights > 0)
+    x, y = points[:, 0], points[:, 1]
+    for i in range(order + 1):
+        for j in range(order + 1 - i):
+            assert weights @ (x**i * y**j) == pytest.approx(monomial_mean(i, j), rel=1e-12, abs=1e-14)
+
+def test_rule_order_out_of_range():
+    with pytest.raises(ValueError):
+        triangle_quadrature(MAX_QUAD_ORDER + 1)
+
+@pytest.mark.parametrize("element", ["P1", "P2"])
+def test_basis_nodal(element):
+    phi, dphi = ref_basis(element, REF_NODES[element])
+    np.testing.assert_allclose(phi, np.eye(len(REF_NODES[element])), atol=1e-14)
+    # partition of unity: gradients sum to zero
+    np.testing.assert_allclose(dphi.sum(axis=1), 0.0, atol=1e-14)